@@ -9,6 +9,7 @@ This module provides a command-line interface for the PDF header detection libra
 import argparse
 import sys
 import os
+import json
 import logging
 from typing import Optional
 
@@ -136,8 +137,13 @@ Examples:
                 if args.verbose or not args.output:
                     print("\n📄 JSON Output:")
                     print("-" * 40)
-                    headers_json = detector.get_headers_json(args.pdf_path, args.min_size)
-                    print(headers_json)
+                    # Serialize the headers we already have instead of
+                    # re-running the detection
+                    clean_headers = [
+                        {k: h[k] for k in ("header", "header_level_name", "page", "header_level")}
+                        for h in headers
+                    ]
+                    print(json.dumps(clean_headers, indent=2, ensure_ascii=False))
                 
             else:
                 print("❌ No headers detected")
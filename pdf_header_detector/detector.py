@@ -9,14 +9,124 @@ headers in PDF documents using intelligent font size analysis.
 """
 
 import os
+import re
 import json
 import logging
-from typing import List, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple
 import fitz  # PyMuPDF
+import numpy as np
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of scanned documents kept in the per-detector cache
+_SCAN_CACHE_MAX = 4
+
+# The detector only consumes span text, size, and bbox origin - ask MuPDF
+# for whitespace preservation alone so image blocks, ligature handling,
+# and clipping work are all skipped
+_MUPDF_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE
+
+# Documents shorter than this are scanned sequentially - thread setup
+# costs more than it saves on small PDFs
+_PARALLEL_MIN_PAGES = 8
+
+# Pages yielding less plain text than this are treated as image-only
+# (scanned) pages and skipped without the full dict extraction
+_MIN_PAGE_TEXT_CHARS = 20
+
+# Common words that indicate body text rather than a header
+_BODY_INDICATORS = frozenset({
+    "the", "and", "of", "in", "to", "for", "with", "on", "at", "by",
+    "this", "that", "these", "those", "such", "can", "will", "should",
+    "figure", "table", "page", "section", "chapter", "appendix", "see"
+})
+
+# Matches any body-text indicator word - used to count indicators across
+# a whole batch of candidate texts in the C regex engine
+_BODY_INDICATOR_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(_BODY_INDICATORS)) + r")\b", re.IGNORECASE
+)
+
+# Fields exposed in the JSON output for each detected header - everything
+# else (underscore-prefixed) is internal scratch data
+_PUBLIC_KEYS = ("header", "header_level_name", "page", "header_level")
+
+try:
+    # orjson serializes in C and is considerably faster than stdlib json
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+@dataclass
+class FontStats:
+    """
+    Precomputed font size statistics shared by the threshold detector and
+    the hierarchy analyzer - built once per scanned document.
+
+    Attributes:
+        uniques (np.ndarray): Distinct rounded font sizes, ascending
+        counts (np.ndarray): Number of spans per distinct size
+        freq_order (np.ndarray): Indices into uniques, most frequent first
+    """
+    uniques: np.ndarray
+    counts: np.ndarray
+    freq_order: np.ndarray
+
+    @classmethod
+    def from_sizes(cls, font_sizes: np.ndarray) -> "FontStats":
+        """Build the statistics from the raw per-span font size array."""
+        uniques, counts = np.unique(font_sizes, return_counts=True)
+        freq_order = np.argsort(-counts, kind="stable")
+        return cls(uniques, counts, freq_order)
+
+    def most_common(self, n: int) -> List[Tuple[float, int]]:
+        """The n most frequent (size, count) pairs, Counter-style."""
+        return [(float(self.uniques[i]), int(self.counts[i]))
+                for i in self.freq_order[:n]]
+
+
+def _extract_spans_py(blocks, page_no, font_size_buf, x_buf, y_buf, page_buf, texts):
+    """Append every non-empty span in blocks to the parallel buffers.
+
+    Pure-Python fallback for the compiled loop in _scan_spans.pyx.
+    """
+    for block in blocks:
+        if "lines" not in block:
+            continue
+
+        for line in block["lines"]:
+            for span in line["spans"]:
+                # isspace() needs no allocation - only spans that survive
+                # the check pay for the stripped copy
+                raw = span["text"]
+                if not raw or raw.isspace():
+                    continue
+                text = raw.strip()
+
+                # bbox is always present in PyMuPDF dict output
+                bbox = span["bbox"]
+                texts.append(text)
+                font_size_buf.append(round(span["size"], 1))  # Round to nearest 0.1pt
+                x_buf.append(bbox[0])
+                y_buf.append(bbox[1])
+                page_buf.append(page_no)
+
+
+try:
+    # Compiled ahead of time when Cython and a C compiler are available
+    from ._scan_spans import extract_spans as _extract_spans
+except ImportError:
+    _extract_spans = _extract_spans_py
+
 
 class HeaderDetector:
     """
@@ -41,6 +151,8 @@ class HeaderDetector:
         self.detected_headers = []
         self.full_text = ""
         self.full_text_words = []
+        self._scan_cache = OrderedDict()
+        self._last_call = None
     
     def detect_headers_by_font_size(self, pdf_path: str, min_size: float = None) -> List[Dict[str, Any]]:
         """
@@ -59,94 +171,91 @@ class HeaderDetector:
         """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-            
-        # First pass: analyze all font sizes to determine optimal threshold
+
+        # Remember the caller's arguments so get_headers_json can reuse
+        # this call's result
+        requested_min_size = min_size
+
+        # Single streaming pass over the document - the auto threshold and
+        # the hierarchy analysis both work from the collected arrays
+        font_sizes, xs, ys, pages, texts = self._scan_document(pdf_path)
+        font_stats = FontStats.from_sizes(font_sizes)
+
+        # Determine the optimal threshold from the collected font sizes
         if min_size is None:
-            min_size = self._auto_detect_header_threshold(pdf_path)
-            
+            min_size = self._threshold_from_sizes(font_stats)
+
         logger.info(f"Detecting headers with font size > {min_size}pt")
-        
-        try:
-            doc = fitz.open(pdf_path)
-        except Exception as e:
-            raise Exception(f"Error opening PDF file: {e}")
-            
-        all_text_elements = []
-        all_font_sizes = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
-            
-            for block in blocks:
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        if text:
-                            font_size = round(span["size"], 1)  # Round to nearest 0.1pt
-                            all_font_sizes.append(font_size)
-                            
-                            bbox = span.get("bbox", [0, 0, 0, 0])
-                            all_text_elements.append({
-                                "text": text,
-                                "font_size": font_size,
-                                "font_name": span["font"],
-                                "is_bold": span["flags"] & 16,
-                                "page": page_num + 1,
-                                "bbox": bbox,
-                                "x": bbox[0],
-                                "y": bbox[1]
-                            })
-        
-        doc.close()
-        
+
         # Analyze font size distribution
-        font_analysis = self._analyze_font_hierarchy(all_font_sizes, min_size)
+        font_analysis = self._analyze_font_hierarchy(font_stats, min_size)
         logger.info(f"Font analysis: {font_analysis}")
-        
-        # Group text elements by Y position (same line across blocks)
-        grouped_elements = self._group_by_y_position(all_text_elements)
-        
+
+        # Group spans by Y position (same line across blocks)
+        order, group_id = self._group_by_y_position(pages, ys)
+
         # Filter for headers based on enhanced font analysis
-        headers = []
-        for group in grouped_elements:
-            max_font_size = max(elem["font_size"] for elem in group)
-            
-            # Check if this font size qualifies as a header
-            if max_font_size in font_analysis["header_levels"]:
-                # Combine text from all elements in the group
-                combined_text = " ".join(elem["text"] for elem in sorted(group, key=lambda x: x["x"]))
-                
-                # Check length criteria (more flexible for different header types)
-                if 2 < len(combined_text) < 300 and not self._is_likely_body_text(combined_text, max_font_size):
-                    # Use properties from the element with max font size
-                    main_element = max(group, key=lambda x: x["font_size"])
-                    
-                    # Determine hierarchy level
-                    header_level = font_analysis["header_levels"][max_font_size]
-                    
-                    headers.append({
-                        "header": combined_text,
-                        "header_level_name": f"level {header_level}",
-                        "page": main_element["page"],
-                        "header_level": header_level,
-                        "_font_size": max_font_size  # Temporary for logging
-                    })
-        
-        # Remove duplicates (same text appearing multiple times)
         unique_headers = []
-        seen_texts = set()
-        
-        for header in headers:
-            if header["header"] not in seen_texts:
-                unique_headers.append(header)
-                seen_texts.add(header["header"])
-        
-        # Sort by page order only since we removed bbox
-        unique_headers.sort(key=lambda x: x["page"])
+        if len(order):
+            group_starts = np.flatnonzero(np.r_[True, group_id[1:] != group_id[:-1]])
+            group_ends = np.r_[group_starts[1:], len(order)]
+
+            # Per-group max font size in a single ufunc sweep
+            max_fs = np.maximum.reduceat(font_sizes[order], group_starts)
+
+            # Mark the groups whose max font size qualifies as a header
+            header_sizes = np.array(sorted(font_analysis["header_levels"]), dtype=np.float32)
+            is_header_group = np.isin(max_fs, header_sizes)
+
+            # Re-sort spans by (group, x) once so every group's text can be
+            # joined left to right by plain slicing
+            x_order = order[np.lexsort((xs[order], group_id))]
+            texts_arr = np.asarray(texts, dtype=object)
+
+            # Gather candidates that pass the cheap length criteria, then
+            # run the body-text heuristic over the whole batch at once
+            candidate_texts = []
+            candidate_sizes = []
+            candidate_levels = []
+            candidate_pages = []
+
+            for g in np.flatnonzero(is_header_group):
+                start, end = group_starts[g], group_ends[g]
+                max_font_size = float(max_fs[g])
+
+                # Combine text from all spans in the group, left to right -
+                # one fancy-indexed slice feeds the join directly
+                combined_text = " ".join(texts_arr[x_order[start:end]])
+
+                # Check length criteria (more flexible for different header types)
+                if 2 < len(combined_text) < 300:
+                    candidate_texts.append(combined_text)
+                    candidate_sizes.append(max_font_size)
+                    candidate_levels.append(font_analysis["header_levels"][max_font_size])
+                    candidate_pages.append(int(pages[x_order[start]]))
+
+            is_body = self._body_text_mask(
+                candidate_texts, np.asarray(candidate_sizes, dtype=np.float32))
+            keep = np.flatnonzero(~is_body)
+
+            if len(keep):
+                # Dedup by text (first occurrence) and sort by page while
+                # still in index space, then emit the final dicts once
+                kept_texts = np.array([candidate_texts[i] for i in keep])
+                first_idx = keep[np.sort(np.unique(kept_texts, return_index=True)[1])]
+                page_nums = np.array([candidate_pages[i] for i in first_idx], dtype=np.int32)
+                final_idx = first_idx[np.argsort(page_nums, kind="stable")]
+
+                unique_headers = [
+                    {
+                        "header": candidate_texts[i],
+                        "header_level_name": f"level {candidate_levels[i]}",
+                        "page": candidate_pages[i],
+                        "header_level": candidate_levels[i],
+                        "_font_size": candidate_sizes[i]  # Temporary for logging
+                    }
+                    for i in final_idx
+                ]
         
         logger.info(f"Found {len(unique_headers)} unique headers with enhanced detection")
         
@@ -154,63 +263,207 @@ class HeaderDetector:
             logger.info(f"  {i+1}. Page {header['page']}: '{header['header']}' ({header['_font_size']:.1f}pt) - {header['header_level_name']}")
         
         self.detected_headers = unique_headers
+        clean_headers = [{k: h[k] for k in _PUBLIC_KEYS} for h in unique_headers]
+        self._last_call = (pdf_path, requested_min_size, _dumps(clean_headers))
         return unique_headers
 
-    def _auto_detect_header_threshold(self, pdf_path: str) -> float:
+    def _scan_document(self, pdf_path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]:
         """
-        Automatically detect the optimal threshold for header detection
-        
+        Scan a PDF once and harvest all text spans into parallel arrays
+
         Args:
             pdf_path (str): Path to the PDF file
-            
+
+        Results are memoized per (real path, mtime, size) so repeated calls
+        against an unchanged file - e.g. detect_headers_by_font_size followed
+        by get_headers_json - reuse the parsed spans instead of re-reading
+        the PDF. The cache holds the most recent documents (LRU).
+
         Returns:
-            float: Optimal minimum font size for headers
+            Tuple: (font_sizes, xs, ys, pages, texts) arrays with one entry
+                per non-empty text span
+
+        Raises:
+            Exception: If there's an error reading the PDF
+        """
+        try:
+            stat = os.stat(pdf_path)
+            cache_key = (os.path.realpath(pdf_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None and cache_key in self._scan_cache:
+            self._scan_cache.move_to_end(cache_key)
+            return self._scan_cache[cache_key]
+
+        try:
+            doc = fitz.open(pdf_path)
+        except Exception as e:
+            raise Exception(f"Error opening PDF file: {e}")
+
+        page_count = len(doc)
+        doc.close()
+
+        # PyMuPDF releases the GIL inside get_text, so page extraction scales
+        # across threads. Each worker opens its own document handle - MuPDF
+        # documents must not be shared between threads.
+        workers = min(os.cpu_count() or 1, max(1, page_count // 2))
+        if page_count < _PARALLEL_MIN_PAGES or workers < 2:
+            chunks = [self._scan_page_range(pdf_path, 0, page_count)]
+        else:
+            step = (page_count + workers - 1) // workers
+            ranges = [(start, min(start + step, page_count))
+                      for start in range(0, page_count, step)]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(
+                    lambda r: self._scan_page_range(pdf_path, r[0], r[1]), ranges))
+
+        # Concatenate the per-chunk buffers in page order
+        texts = []
+        font_size_buf = []
+        x_buf = []
+        y_buf = []
+        page_buf = []
+        for chunk_sizes, chunk_xs, chunk_ys, chunk_pages, chunk_texts in chunks:
+            font_size_buf.extend(chunk_sizes)
+            x_buf.extend(chunk_xs)
+            y_buf.extend(chunk_ys)
+            page_buf.extend(chunk_pages)
+            texts.extend(chunk_texts)
+
+        result = (np.asarray(font_size_buf, dtype=np.float32),
+                  np.asarray(x_buf, dtype=np.float32),
+                  np.asarray(y_buf, dtype=np.float32),
+                  np.asarray(page_buf, dtype=np.int32),
+                  texts)
+
+        if cache_key is not None:
+            self._scan_cache[cache_key] = result
+            while len(self._scan_cache) > _SCAN_CACHE_MAX:
+                self._scan_cache.popitem(last=False)
+
+        return result
+
+    def _scan_page_range(self, pdf_path: str, start: int, stop: int) -> Tuple[List[float], List[float], List[float], List[int], List[str]]:
+        """
+        Scan a contiguous page range with a private document handle
+
+        Args:
+            pdf_path (str): Path to the PDF file
+            start (int): First page index (0-based, inclusive)
+            stop (int): Last page index (exclusive)
+
+        Returns:
+            Tuple: (font_sizes, xs, ys, pages, texts) lists with one entry
+                per non-empty text span
         """
         doc = fitz.open(pdf_path)
-        all_font_sizes = []
-        
-        # Quick scan to get all font sizes
-        for page_num in range(min(5, len(doc))):  # Sample first 5 pages
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
-            
-            for block in blocks:
-                if "lines" not in block:
+
+        # Harvest spans into parallel (structure-of-arrays) buffers instead of
+        # one dict per span - keeps memory per span small and lets the
+        # downstream grouping/filtering work on NumPy arrays.
+        texts = []
+        font_size_buf = []
+        x_buf = []
+        y_buf = []
+        page_buf = []
+
+        try:
+            for page_num in range(start, stop):
+                page = doc[page_num]
+
+                # Plain-text extraction is much cheaper than the dict walk -
+                # use it to skip scanned/image-only pages outright
+                if len(page.get_text("text").strip()) < _MIN_PAGE_TEXT_CHARS:
                     continue
-                    
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        if span["text"].strip():
-                            all_font_sizes.append(round(span["size"], 1))
-        
-        doc.close()
-        
-        # Analyze font distribution
-        from collections import Counter
-        size_counts = Counter(all_font_sizes)
-        unique_sizes = sorted(set(all_font_sizes), reverse=True)
-        
+
+                blocks = page.get_text("dict", flags=_MUPDF_FLAGS)["blocks"]
+                _extract_spans(blocks, page_num + 1,
+                               font_size_buf, x_buf, y_buf, page_buf, texts)
+        finally:
+            doc.close()
+
+        return font_size_buf, x_buf, y_buf, page_buf, texts
+
+    def _threshold_from_sizes(self, font_stats: FontStats) -> float:
+        """
+        Determine the optimal header threshold from collected font sizes
+
+        Args:
+            font_stats (FontStats): Precomputed size statistics for the document
+
+        Returns:
+            float: Optimal minimum font size for headers
+        """
+        uniques = font_stats.uniques
+
         # Find the most common font sizes (likely body text)
-        most_common = size_counts.most_common(3)
+        most_common = font_stats.most_common(3)
         logger.info(f"Font size analysis for threshold detection: {most_common}")
-        
+
         # Conservative approach: start with a low threshold to capture more headers
         # We'll filter out body text in the hierarchy analysis
         min_threshold = 12.0  # Conservative minimum
-        
+
         # Check if we have large headers (>25pt) - these are definitely headers
-        large_headers = [s for s in unique_sizes if s > 25.0]
-        if large_headers:
+        if (uniques > 25.0).any():
             # If we have large headers, use a more permissive threshold
             threshold = min_threshold
         else:
             # No large headers found, be more conservative
             most_common_size = most_common[0][0] if most_common else 12.0
             threshold = most_common_size + 1.0
-            
+
         logger.info(f"Auto-detected header threshold: {threshold}pt")
         return threshold
 
+    def _auto_detect_header_threshold(self, pdf_path: str) -> float:
+        """
+        Automatically detect the optimal threshold for header detection
+
+        Kept as a public-style wrapper; internal callers share the single
+        document scan and go through _threshold_from_sizes directly.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+
+        Returns:
+            float: Optimal minimum font size for headers
+        """
+        font_sizes = self._scan_document(pdf_path)[0]
+        return self._threshold_from_sizes(FontStats.from_sizes(font_sizes))
+
+    def _body_text_mask(self, candidate_texts: List[str], font_sizes: np.ndarray) -> np.ndarray:
+        """
+        Batch version of _is_likely_body_text for a list of candidate headers
+
+        Indicator words are counted with one compiled regex per text and the
+        thresholds are applied with NumPy arithmetic over the whole batch.
+
+        Args:
+            candidate_texts (List[str]): Candidate header texts
+            font_sizes (np.ndarray): Max font size of each candidate
+
+        Returns:
+            np.ndarray: Boolean mask, True where a candidate looks like body text
+        """
+        if not candidate_texts:
+            return np.zeros(0, dtype=bool)
+
+        text_lens = np.array([len(t) for t in candidate_texts])
+        word_counts = np.array([len(t.split()) for t in candidate_texts])
+        body_counts = np.array([len(_BODY_INDICATOR_RE.findall(t)) for t in candidate_texts])
+
+        # If more than 40% are common words, likely body text
+        # But be less strict for shorter text (potential headers)
+        thresholds = np.where(word_counts > 8, 0.5, 0.6)
+        is_body = ((text_lens > 200)
+                   | (word_counts > 15)
+                   | (body_counts > word_counts * thresholds))
+
+        # Large fonts are likely headers, not body text
+        return is_body & (font_sizes <= 20.0)
+
     def _is_likely_body_text(self, text: str, font_size: float = None) -> bool:
         """
         Heuristic to identify if text is likely body text rather than a header
@@ -229,115 +482,86 @@ class HeaderDetector:
         # Very long text is probably body text
         if len(text) > 200:
             return True
-            
-        # Text with common body text patterns
-        body_indicators = [
-            "the", "and", "of", "in", "to", "for", "with", "on", "at", "by",
-            "this", "that", "these", "those", "such", "can", "will", "should",
-            "figure", "table", "page", "section", "chapter", "appendix", "see"
-        ]
-        
+
+        # Estimate the word count from the space count first - one C call
+        # instead of allocating a lowered copy plus a word list just to
+        # reject a long sentence
+        if text.count(' ') + 1 > 15:
+            return True
+
         words = text.lower().split()
         if len(words) > 15:  # Very long sentences are usually body text
             return True
-            
-        # Count body text indicators
-        body_count = sum(1 for word in words if word in body_indicators)
+
+        # Count body text indicators (O(1) membership in the module-level set)
+        body_count = sum(1 for word in words if word in _BODY_INDICATORS)
         
         # If more than 40% are common words, likely body text
         # But be less strict for shorter text (potential headers)
         threshold = 0.5 if len(words) > 8 else 0.6
         return body_count > len(words) * threshold
     
-    def _group_by_y_position(self, elements: List[Dict[str, Any]], tolerance: float = 1.0) -> List[List[Dict[str, Any]]]:
+    def _group_by_y_position(self, pages: np.ndarray, ys: np.ndarray, tolerance: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Group text elements that are on the same Y position (same line) and same page
-        
+        Group spans that are on the same Y position (same line) and same page
+
         Args:
-            elements (List[Dict[str, Any]]): List of text elements
+            pages (np.ndarray): Page number of each span
+            ys (np.ndarray): Y position of each span
             tolerance (float): Y-position tolerance for grouping
-            
+
         Returns:
-            List[List[Dict[str, Any]]]: Grouped elements
+            Tuple[np.ndarray, np.ndarray]: (order, group_id) where order sorts
+                the spans by (page, y) and group_id assigns each sorted span
+                to its line group (0, 1, 2, ...)
         """
-        if not elements:
-            return []
-        
-        # Group by page first, then by Y position within each page
-        pages = {}
-        for element in elements:
-            page_num = element["page"]
-            if page_num not in pages:
-                pages[page_num] = []
-            pages[page_num].append(element)
-        
-        all_groups = []
-        
-        for page_num, page_elements in pages.items():
-            # Sort by Y position within the page
-            sorted_elements = sorted(page_elements, key=lambda x: x["y"])
-            
-            if not sorted_elements:
-                continue
-                
-            page_groups = []
-            current_group = [sorted_elements[0]]
-            current_y = sorted_elements[0]["y"]
-            
-            for element in sorted_elements[1:]:
-                if abs(element["y"] - current_y) <= tolerance:
-                    # Same line - add to current group
-                    current_group.append(element)
-                else:
-                    # Different line - start new group
-                    if current_group:
-                        page_groups.append(current_group)
-                    current_group = [element]
-                    current_y = element["y"]
-            
-            # Don't forget the last group
-            if current_group:
-                page_groups.append(current_group)
-                
-            all_groups.extend(page_groups)
-        
-        return all_groups
+        if len(pages) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # Sort by page first, then by Y position within each page
+        order = np.lexsort((ys, pages))
+        y = ys[order]
+        p = pages[order]
+
+        # A new line starts wherever the page changes or the Y gap exceeds
+        # the tolerance - one vectorized pass instead of a per-span loop
+        breaks = np.empty(len(order), dtype=bool)
+        breaks[0] = True
+        breaks[1:] = (np.diff(y) > tolerance) | (np.diff(p) != 0)
+        group_id = np.cumsum(breaks) - 1
+
+        return order, group_id
 
-    def _analyze_font_hierarchy(self, all_font_sizes: List[float], min_size: float) -> Dict[str, Any]:
+    def _analyze_font_hierarchy(self, font_stats: FontStats, min_size: float) -> Dict[str, Any]:
         """
         Enhanced font hierarchy analysis with automatic body text detection
-        
+
         Args:
-            all_font_sizes (List[float]): List of all font sizes in the document
+            font_stats (FontStats): Precomputed size statistics for the document
             min_size (float): Minimum font size threshold for initial filtering
-            
+
         Returns:
             Dict[str, Any]: Dictionary with font analysis and hierarchy levels
         """
-        # Round font sizes to handle floating-point precision issues (to nearest 0.1pt)
-        rounded_sizes = [round(size, 1) for size in all_font_sizes]
-        all_unique_sizes = sorted(set(rounded_sizes), reverse=True)
-        
+        uniques = font_stats.uniques
+        all_unique_sizes = uniques[::-1].tolist()
+
         logger.info(f"All font sizes (rounded): {all_unique_sizes[:10]}")
-        
+
         # Get font sizes above minimum threshold
-        header_font_sizes = [size for size in rounded_sizes if size > min_size]
-        header_unique_sizes = sorted(set(header_font_sizes), reverse=True)
-        
+        header_unique_sizes = uniques[uniques > min_size][::-1].tolist()
+
         logger.info(f"Header font sizes (>{min_size}pt): {header_unique_sizes}")
-        
+
         # Enhanced logic: Auto-detect body text as the most common small font
-        # Count frequency of each font size
-        from collections import Counter
-        size_counts = Counter(rounded_sizes)
-        
         # Find the most common font sizes (likely body text)
-        most_common = size_counts.most_common(5)
+        most_common = font_stats.most_common(5)
         logger.info(f"Most common font sizes: {most_common}")
-        
+
         # Identify body text candidates (frequent, smaller fonts)
         # Only consider fonts below a reasonable header threshold (20pt)
-        body_text_candidates = [size for size, count in most_common 
+        body_text_candidates = [size for size, count in most_common
                                if size <= 20.0 and count > 5]
         
         if body_text_candidates:
@@ -360,38 +584,42 @@ class HeaderDetector:
         
         logger.info(f"Final header sizes for hierarchy (excluding body text): {filtered_sizes}")
         
-        # Group very similar font sizes (within 0.5pt) to handle rounding issues
+        # Group very similar font sizes (within 0.5pt) to handle rounding issues.
+        # filtered_sizes is sorted descending, so a single linear sweep suffices:
+        # a new group opens whenever the gap from the group's anchor exceeds 0.5pt
         grouped_sizes = []
-        used_sizes = set()
-        
-        for size in filtered_sizes:
-            if size in used_sizes:
-                continue
-                
-            # Find all sizes within 0.5pt of this one
-            similar_sizes = [s for s in filtered_sizes 
-                           if abs(s - size) <= 0.5 and s not in used_sizes]
-            
-            if similar_sizes:
-                # Use the most common size in the group, or the largest if tied
-                group_representative = max(similar_sizes)
-                grouped_sizes.append(group_representative)
-                used_sizes.update(similar_sizes)
-        
-        # Sort grouped sizes in descending order
-        grouped_sizes.sort(reverse=True)
+        i = 0
+        while i < len(filtered_sizes):
+            anchor = filtered_sizes[i]
+            j = i + 1
+            while j < len(filtered_sizes) and anchor - filtered_sizes[j] <= 0.5:
+                j += 1
+            # The anchor is the largest size in its group
+            grouped_sizes.append(anchor)
+            i = j
+
         logger.info(f"Grouped header sizes: {grouped_sizes}")
-        
+
         # Create hierarchy levels (level1 = largest font, level2 = second largest, etc.)
         header_levels = {}
         size_to_level = {}
-        
-        for i, grouped_size in enumerate(grouped_sizes, 1):
-            # Map all similar sizes to the same level
-            for original_size in header_unique_sizes:
-                if abs(original_size - grouped_size) <= 0.5:
-                    header_levels[original_size] = i
-                    size_to_level[original_size] = i
+
+        if grouped_sizes:
+            # Map each header size to its grouped size via searchsorted; when a
+            # size sits within 0.5pt of two groups the smaller one wins, which
+            # matches the previous last-assignment-wins behaviour
+            grouped_asc = np.asarray(grouped_sizes[::-1], dtype=np.float32)
+            total = len(grouped_sizes)
+            positions = np.searchsorted(grouped_asc, np.asarray(header_unique_sizes, dtype=np.float32))
+
+            for size, pos in zip(header_unique_sizes, positions):
+                level = None
+                for q in (int(pos), int(pos) - 1):
+                    if 0 <= q < total and abs(size - float(grouped_asc[q])) <= 0.5:
+                        level = total - q
+                if level is not None:
+                    header_levels[size] = level
+                    size_to_level[size] = level
         
         return {
             "all_sizes": all_unique_sizes,
@@ -429,14 +657,11 @@ class HeaderDetector:
             bool: True if successful, False otherwise
         """
         try:
-            # Remove temporary fields before saving
-            clean_headers = []
-            for header in headers:
-                clean_header = {k: v for k, v in header.items() if not k.startswith('_')}
-                clean_headers.append(clean_header)
-            
+            # Keep only the public fields
+            clean_headers = [{k: header[k] for k in _PUBLIC_KEYS} for header in headers]
+
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(clean_headers, f, indent=2, ensure_ascii=False)
+                f.write(_dumps(clean_headers))
             logger.info(f"Headers saved to {output_file}")
             return True
         except Exception as e:
@@ -454,13 +679,12 @@ class HeaderDetector:
         Returns:
             str: JSON string representation of detected headers
         """
-        headers = self.detect_headers_by_font_size(pdf_path, min_size)
-        # Remove temporary fields before converting to JSON
-        clean_headers = []
-        for header in headers:
-            clean_header = {k: v for k, v in header.items() if not k.startswith('_')}
-            clean_headers.append(clean_header)
-        return json.dumps(clean_headers, indent=2, ensure_ascii=False)
+        # Reuse the previous detection when the arguments match - avoids
+        # re-running the whole pipeline in call sequences like
+        # detect_headers_by_font_size followed by get_headers_json
+        if self._last_call is None or self._last_call[:2] != (pdf_path, min_size):
+            self.detect_headers_by_font_size(pdf_path, min_size)
+        return self._last_call[2]
 
     def get_font_analysis(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -474,24 +698,9 @@ class HeaderDetector:
         """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-            
-        doc = fitz.open(pdf_path)
-        all_font_sizes = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
-            
-            for block in blocks:
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        if span["text"].strip():
-                            all_font_sizes.append(round(span["size"], 1))
-        
-        doc.close()
-        
-        threshold = self._auto_detect_header_threshold(pdf_path)
-        return self._analyze_font_hierarchy(all_font_sizes, threshold)
+
+        # One scan serves both the threshold detection and the analysis
+        font_sizes = self._scan_document(pdf_path)[0]
+        font_stats = FontStats.from_sizes(font_sizes)
+        threshold = self._threshold_from_sizes(font_stats)
+        return self._analyze_font_hierarchy(font_stats, threshold)
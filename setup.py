@@ -17,6 +17,18 @@ def read_readme():
             return f.read()
     return "A library for intelligent PDF header detection using font analysis"
 
+# Build the optional compiled span-extraction loop
+def get_ext_modules():
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        # No Cython available - the package falls back to the pure-Python loop
+        return []
+    return cythonize(
+        [os.path.join('pdf_header_detector', '_scan_spans.pyx')],
+        language_level=3,
+    )
+
 # Read the requirements
 def read_requirements():
     requirements_path = os.path.join(os.path.dirname(__file__), 'requirements.txt')
@@ -52,6 +64,7 @@ setup(
     ],
     python_requires=">=3.7",
     install_requires=read_requirements(),
+    ext_modules=get_ext_modules(),
     extras_require={
         "dev": [
             "pytest>=6.0",